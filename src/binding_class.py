@@ -10,7 +10,7 @@ from dataclasses import dataclass
 from clang.cindex import CursorKind
 
 from cparser_header import Header
-from cparser_types import CType, CPointerType, CTypedefType, CRecordType, wrap_type
+from cparser_types import CType, wrap_type
 from binding_func import Func
 from binding_generic_specializations import gen_ctype_specializations
 from binding_typemap import Typemap
@@ -18,6 +18,9 @@ from binding_typemap import Typemap
 classes: OrderedDict[str, "Class"] = OrderedDict()
 class_structs: Dict[str, "Class"] = {}
 
+# Nested declarations skipped when parsing struct fields
+nested_decl_kinds = frozenset({CursorKind.STRUCT_DECL, CursorKind.UNION_DECL})
+
 
 @dataclass
 class Field:
@@ -35,6 +38,17 @@ class Class:
     A collection of fields, static functions, and methods wrapping a C struct
     """
 
+    __slots__ = (
+        "name",
+        "struct_name",
+        "header",
+        "fields",
+        "funcs",
+        "methods",
+        "constructor",
+        "destructor",
+    )
+
     name: str
     struct_name: str
     header: Header
@@ -121,7 +135,7 @@ class Class:
                 gen_ctype_specializations([field], ctype)
                 self.fields[name] = Field(name, rename, ctype)
 
-            elif field.kind not in [CursorKind.STRUCT_DECL, CursorKind.UNION_DECL]:
+            elif field.kind not in nested_decl_kinds:
                 raise Exception(
                     f"Unexpected struct child of kind: {field.kind} at {field.location}"
                 )
@@ -205,27 +219,12 @@ class Class:
         (eg. rz_reg_64_to_32 -> 64_to_32) which need to be manually added
         """
         method_names = set()
-        for name, cfunc in self.header.cfuncs.items():
-            if not name.startswith(prefix):
-                continue
+        for name, cfunc in self.header.prefixed_cfuncs(prefix):
             if "RZ_API" not in cfunc.attrs:
                 continue
-            if len(cfunc.args) == 0:
-                continue
 
             # Select functions with class struct as first argument
-            ctype = cfunc.args[0].ctype
-            if not isinstance(ctype, CPointerType):
-                continue
-
-            ctype = ctype.pointee
-            if isinstance(ctype, CTypedefType):
-                ctype = ctype.canonical
-
-            if not isinstance(ctype, CRecordType):
-                continue
-
-            if ctype.decl_spelling != self.struct_name:
+            if cfunc.self_struct_name != self.struct_name:
                 continue
 
             rename = name[len(prefix) :]
@@ -245,9 +244,7 @@ class Class:
         Add C functions with a given prefix as static functions
         """
         func_names = set()
-        for name, cfunc in self.header.cfuncs.items():
-            if not name.startswith(prefix):
-                continue
+        for name, cfunc in self.header.prefixed_cfuncs(prefix):
             if "RZ_API" not in cfunc.attrs:
                 continue
 
@@ -17,6 +17,8 @@ class Func:
     A wrapped C function
     """
 
+    __slots__ = ("cfunc", "typemaps")
+
     cfunc: "CFunc"
     typemaps: List[Typemap]
 
@@ -83,6 +85,8 @@ class GenericFunc(Func):
     A wrapped C function with generic args or a generic return value
     """
 
+    __slots__ = ("generic_ret", "generic_args")
+
     generic_ret: bool
     generic_args: Set[str]
 
@@ -3,7 +3,18 @@ SPDX-FileCopyrightText: 2022 wingdeans <wingdeans@protonmail.com>
 SPDX-License-Identifier: LGPL-3.0-only
 """
 
-from typing import List, OrderedDict, DefaultDict, Set, Optional, TYPE_CHECKING
+from typing import (
+    List,
+    Dict,
+    DefaultDict,
+    Set,
+    Tuple,
+    Optional,
+    TYPE_CHECKING,
+    cast,
+)
+
+import re
 
 from clang.cindex import Cursor, CursorKind, SourceRange
 
@@ -13,7 +24,10 @@ from binding_generic_specializations import generic_structs
 if TYPE_CHECKING:
     from cparser_header import Header
 
-generics: OrderedDict[str, "Generic"] = OrderedDict()
+generics: Dict[str, "Generic"] = {}
+
+# Matches a /*<type>*/ comment, capturing the type without a leading const
+type_comment_pattern = re.compile(r"/\*<(?:const )?(.+)>\*/", re.DOTALL)
 
 
 class Generic:
@@ -25,11 +39,13 @@ class Generic:
     header: "Header"
     pointer: bool  # If type comments should have a pointer
 
-    methods: OrderedDict[str, GenericFunc]
+    methods: Dict[str, GenericFunc]
 
     specializations: Set[str]
+    # Maps (file, line, column) of type comment cursors to specializations
+    specialization_cache: Dict[Tuple[str, int, int], Optional[str]]
 
-    python_methods: OrderedDict[str, List[str]]
+    python_methods: Dict[str, List[str]]
     specialization_extensions: DefaultDict[str, List[str]]
 
     def __init__(
@@ -46,10 +62,11 @@ class Generic:
         self.pointer = pointer
         self.dependencies = dependencies or []
 
-        self.methods = OrderedDict()
+        self.methods = {}
         self.specializations = set()
+        self.specialization_cache = {}
 
-        self.python_methods = OrderedDict()
+        self.python_methods = {}
         self.specialization_extensions = DefaultDict(list)
 
         assert typedef not in generics
@@ -89,22 +106,34 @@ class Generic:
 
         Returns None if no specialization found
         """
+        # Typedef cursors are visited once per use of the typedef,
+        # so avoid tokenizing the same location again
+        location = cursor.location
+        key = (location.file.name, location.line, location.column)
+        if key in self.specialization_cache:
+            return self.specialization_cache[key]
+
         # Extract type comment
         typeref = next(
-            child
-            for child in cursor.get_children()
-            if child.kind == CursorKind.TYPE_REF
+            (
+                child
+                for child in cursor.get_children()
+                if child.kind == CursorKind.TYPE_REF
+            ),
+            None,
         )
+        if typeref is None:
+            raise Exception(f"No type reference found at {cursor.location}")
 
         src_range = SourceRange.from_locations(typeref.extent.end, cursor.location)
         token = next(cursor.translation_unit.get_tokens(extent=src_range)).spelling
 
-        if not token.startswith("/*<") or not token.endswith(">*/"):
+        match = type_comment_pattern.fullmatch(token)
+        if not match:
+            self.specialization_cache[key] = None
             return None
 
-        name = token[3:-3]
-        if name.startswith("const "):
-            name = name[len("const ") :]
+        name = cast(str, match.group(1))
 
         # Validate comment and add specialization
         if self.pointer:
@@ -129,6 +158,7 @@ class Generic:
         for dependency in self.dependencies:
             dependency.specializations.add(specialization)
 
+        self.specialization_cache[key] = specialization
         return specialization
 
     def add_python_method(self, decl: str, *lines: str) -> None:
@@ -39,7 +39,7 @@ class Typemap:
         Check if a typemap applies to a function
         """
         args = [
-            TypemapArg(arg.ctype.type_.spelling, arg.cursor.spelling)
+            TypemapArg(arg.ctype.spelling, arg.cursor.spelling)
             for arg in func.cfunc.args
         ]
 
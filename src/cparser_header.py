@@ -3,14 +3,15 @@ SPDX-FileCopyrightText: 2022 wingdeans <wingdeans@protonmail.com>
 SPDX-License-Identifier: LGPL-3.0-only
 """
 
-from typing import List, OrderedDict, DefaultDict, Set, Optional
+from typing import List, OrderedDict, DefaultDict, FrozenSet, Tuple, Optional
 
 from functools import cached_property
+import bisect
 import os
 
 from clang.cindex import TranslationUnit, Cursor, CursorKind
 
-from cparser_types import CType, wrap_type
+from cparser_types import CType, CPointerType, CTypedefType, CRecordType, wrap_type
 
 ### Cursor wrappers ###
 class AttrCursor:
@@ -24,15 +25,15 @@ class AttrCursor:
         self.cursor = cursor
 
     @cached_property
-    def attrs(self) -> Set[str]:
+    def attrs(self) -> FrozenSet[str]:
         """
         Get annotation __attribute__'s on cursor
         """
-        return {
+        return frozenset(
             child.spelling
             for child in self.cursor.get_children()
             if child.kind == CursorKind.ANNOTATE_ATTR
-        }
+        )
 
 
 class CFuncArg(AttrCursor):
@@ -73,6 +74,29 @@ class CFunc(AttrCursor):
         """
         return wrap_type(self.cursor.result_type)
 
+    @cached_property
+    def self_struct_name(self) -> Optional[str]:
+        """
+        Get the name of the struct which the first argument points to
+
+        Returns None if the first argument is not a struct pointer
+        """
+        if len(self.args) == 0:
+            return None
+
+        ctype = self.args[0].ctype
+        if not isinstance(ctype, CPointerType):
+            return None
+
+        ctype = ctype.pointee
+        if isinstance(ctype, CTypedefType):
+            ctype = ctype.canonical
+
+        if not isinstance(ctype, CRecordType):
+            return None
+
+        return ctype.decl_spelling
+
 
 ### Configuration ###
 rizin_include_path: Optional[str] = None
@@ -81,6 +105,12 @@ clang_args: List[str] = []
 ### Headers ###
 headers: List["Header"] = []
 
+# SDB hashtable headers, which are instantiated from ht_inc.h
+ht_header_names = frozenset({"ht_pp.h", "ht_pu.h", "ht_up.h", "ht_uu.h"})
+
+# (basename, name) pairs of macros which may be redefined
+redefinable_macros = frozenset({("rz_types.h", "__WINDOWS__")})
+
 
 class HeaderBuilder:
     """
@@ -108,7 +138,7 @@ class HeaderBuilder:
 
         # Parse ht_inc.h if importing SDB hashtable header
         self.extra_filename = None
-        if name_segments[-1] in ["ht_pp.h", "ht_pu.h", "ht_up.h", "ht_uu.h"]:
+        if name_segments[-1] in ht_header_names:
             self.extra_filename = "ht_inc.h"
 
     def translation_unit(self) -> TranslationUnit:
@@ -142,6 +172,7 @@ class Header:
     cursors: DefaultDict[CursorKind, OrderedDict[str, Cursor]]
     cursor_kinds: OrderedDict[str, CursorKind]
     cfuncs: OrderedDict[str, CFunc]  # Store __attributes__
+    cfunc_names: List[Tuple[str, int]]  # Sorted (name, declaration index)
 
     def __init__(self, translation_unit: TranslationUnit, builder: HeaderBuilder):
         headers.append(self)
@@ -186,9 +217,10 @@ class Header:
                 elif cursor.kind == CursorKind.MACRO_DEFINITION:
                     assert prev.kind == CursorKind.MACRO_DEFINITION
                     basename = os.path.basename(cursor_file_name)
-                    assert (basename, name) in [
-                        ("rz_types.h", "__WINDOWS__")
-                    ], f"Unexpected redefinition of macro {name} in file {basename}"
+                    assert (basename, name) in redefinable_macros, (
+                        f"Unexpected redefinition of macro {name} "
+                        f"in file {basename}"
+                    )
                 else:
                     raise Exception(
                         f"Unexpected redefinition of symbol: {name}, "
@@ -201,6 +233,27 @@ class Header:
             else:
                 self.cursors[cursor.kind][name] = cursor
 
+        # Index function names for prefix lookups
+        self.cfunc_names = sorted((name, i) for i, name in enumerate(self.cfuncs))
+
+    def prefixed_cfuncs(self, prefix: str) -> List[Tuple[str, CFunc]]:
+        """
+        Get remaining CFuncs whose names start with prefix,
+        in declaration order
+        """
+        matches = []
+        position = bisect.bisect_left(self.cfunc_names, (prefix,))
+        while position < len(self.cfunc_names):
+            name, index = self.cfunc_names[position]
+            if not name.startswith(prefix):
+                break
+            if name in self.cfuncs:
+                matches.append((index, name))
+            position += 1
+
+        matches.sort()
+        return [(name, self.cfuncs[name]) for _, name in matches]
+
     def pop(self, kind: CursorKind, name: str) -> Cursor:
         """
         Remove and return a cursor with the given name and kind
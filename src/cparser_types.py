@@ -6,6 +6,7 @@ SPDX-License-Identifier: LGPL-3.0-only
 from typing import List, Optional, Union, NoReturn, TYPE_CHECKING
 
 from dataclasses import dataclass
+from functools import cached_property
 
 from clang.cindex import Cursor, Type, TypeKind
 
@@ -21,6 +22,20 @@ class CBaseType:
 
     type_: Type
 
+    @cached_property
+    def spelling(self) -> str:
+        """
+        Get type spelling (calls into libclang only once)
+        """
+        return self.type_.spelling
+
+    @cached_property
+    def const_qualified(self) -> bool:
+        """
+        Get whether type is const (calls into libclang only once)
+        """
+        return self.type_.is_const_qualified()
+
 
 @dataclass
 class CPrimitiveType(CBaseType):
@@ -96,6 +111,37 @@ CType = Union[
 ]
 
 
+primitive_kinds = frozenset(
+    {
+        TypeKind.ENUM,
+        TypeKind.VOID,
+        TypeKind.BOOL,
+        TypeKind.FLOAT,
+        TypeKind.DOUBLE,
+        TypeKind.LONGDOUBLE,
+        # Unsigned
+        TypeKind.CHAR_U,
+        TypeKind.UCHAR,
+        TypeKind.CHAR16,
+        TypeKind.CHAR32,
+        TypeKind.USHORT,
+        TypeKind.UINT,
+        TypeKind.ULONG,
+        TypeKind.ULONGLONG,
+        # Signed
+        TypeKind.CHAR_S,
+        TypeKind.SCHAR,
+        TypeKind.WCHAR,
+        TypeKind.SHORT,
+        TypeKind.INT,
+        TypeKind.LONG,
+        TypeKind.LONGLONG,
+    }
+)
+
+array_kinds = frozenset({TypeKind.CONSTANTARRAY, TypeKind.INCOMPLETEARRAY})
+
+
 def wrap_type(type_: Type) -> CType:
     """
     Wrap a type
@@ -103,11 +149,15 @@ def wrap_type(type_: Type) -> CType:
     while type_.kind == TypeKind.ELABORATED:
         type_ = type_.get_named_type()
 
+    # Primitive types (checked first, as they are the most common)
+    if type_.kind in primitive_kinds:
+        return CPrimitiveType(type_)
+
     # Complex types
     if type_.kind == TypeKind.POINTER:
         return CPointerType(type_, pointee=wrap_type(type_.get_pointee()))
 
-    if type_.kind in [TypeKind.CONSTANTARRAY, TypeKind.INCOMPLETEARRAY]:
+    if type_.kind in array_kinds:
         array_t = CArrayType(type_, element=wrap_type(type_.get_array_element_type()))
         if type_.kind == TypeKind.CONSTANTARRAY:
             array_t.element_count = type_.element_count
@@ -134,33 +184,6 @@ def wrap_type(type_: Type) -> CType:
 
         return CRecordType(type_, decl_spelling=decl_spelling)
 
-    # Primitive types
-    if type_.kind in [
-        TypeKind.ENUM,
-        TypeKind.VOID,
-        TypeKind.BOOL,
-        TypeKind.FLOAT,
-        TypeKind.DOUBLE,
-        TypeKind.LONGDOUBLE,
-        # Unsigned
-        TypeKind.CHAR_U,
-        TypeKind.UCHAR,
-        TypeKind.CHAR16,
-        TypeKind.CHAR32,
-        TypeKind.USHORT,
-        TypeKind.UINT,
-        TypeKind.ULONG,
-        TypeKind.ULONGLONG,
-        # Signed
-        TypeKind.CHAR_S,
-        TypeKind.SCHAR,
-        TypeKind.WCHAR,
-        TypeKind.SHORT,
-        TypeKind.INT,
-        TypeKind.LONG,
-        TypeKind.LONGLONG,
-    ]:
-        return CPrimitiveType(type_)
     raise Exception(f"Unknown type kind {type_.kind}")
 
 
@@ -13,9 +13,13 @@ from typing import (
     Optional,
     Iterator,
     TextIO,
+    cast,
 )
 
+import io
 import os
+import pickle
+import concurrent.futures
 from contextlib import contextmanager, suppress
 from dataclasses import dataclass
 from itertools import chain
@@ -44,6 +48,35 @@ doxygen_path: Optional[str] = None
 DoxygenElements = Dict[str, Element]
 
 
+def parse_doxygen_file(path: str) -> List[Tuple[str, Element]]:
+    """
+    Parse a Doxygen XML file into (name, element) pairs
+    for each function, in document order
+
+    Top-level so that it can be run in a worker process
+    """
+    functions = []
+
+    # Stream the file, dropping subtrees that are never looked up
+    # (file compounds embed their entire source as a programlisting)
+    events = cast(Iterator[Tuple[str, Element]], ET.iterparse(path))
+    for _, node in events:
+        if node.tag == "programlisting":
+            node.clear()
+            continue
+        if node.tag != "memberdef":
+            continue
+        if node.attrib.get("kind") != "function":
+            node.clear()
+            continue
+
+        name = node.findtext("name")
+        assert name
+        functions.append((name, node))
+
+    return functions
+
+
 class DoxygenFiles(Dict[str, DoxygenElements]):
     """
     Dictionary wrapper for retrieving XML elements from a filename
@@ -60,14 +93,14 @@ class DoxygenFiles(Dict[str, DoxygenElements]):
         super().__init__()
 
     def __missing__(self, path: str) -> DoxygenElements:
-        tree = ET.parse(path)
+        return self.store(path, parse_doxygen_file(path))
 
+    def store(self, path: str, functions: List[Tuple[str, Element]]) -> DoxygenElements:
+        """
+        Store the parsed functions of a file, dropping duplicated names
+        """
         nodes: DoxygenElements = {}
-        for node in tree.findall(
-            "./compounddef/sectiondef/memberdef[@kind='function']"
-        ):
-            name = node.findtext("name")
-            assert name
+        for name, node in functions:
             if name in self.names:
                 if name in nodes:
                     del nodes[name]
@@ -78,6 +111,28 @@ class DoxygenFiles(Dict[str, DoxygenElements]):
 
         return nodes
 
+    def prefetch(self, paths: List[str]) -> None:
+        """
+        Parse files in worker processes
+
+        Files are stored in the order given, so duplicated names
+        resolve the same way as if the files were accessed in that order
+        """
+        missing: List[str] = []
+        seen: Set[str] = set()
+        for path in paths:
+            if path not in self and path not in seen:
+                seen.add(path)
+                missing.append(path)
+        if not missing:
+            return
+
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            for path, functions in zip(
+                missing, executor.map(parse_doxygen_file, missing)
+            ):
+                self.store(path, functions)
+
 
 @dataclass
 class DoxygenFile:
@@ -105,6 +160,12 @@ class DoxygenFunctions:
         self.function_files = DefaultDict(list)
 
     def __getitem__(self, name: str) -> Element:
+        return doxygen_files[self.file(name).path][name]
+
+    def file(self, name: str) -> DoxygenFile:
+        """
+        Get the file which defines a function
+        """
         files = self.function_files[name]
 
         if len(files) == 0:
@@ -117,7 +178,7 @@ class DoxygenFunctions:
                 len(files) == 1
             ), f"Function {name} is found in multiple files: {files}"
 
-        return doxygen_files[files[0].path][name]
+        return files[0]
 
 
 doxygen_functions = DoxygenFunctions()
@@ -142,6 +203,8 @@ class SphinxWriter(Writer):
     Extended Writer class with additional sphinx-specific helpers
     """
 
+    __slots__ = ("header_level",)
+
     header_level: int
 
     def __init__(self, output: TextIO):
@@ -156,9 +219,9 @@ class SphinxWriter(Writer):
         """
         punctuation_line = punctuation * len(line)
         if overline:
-            self.line(punctuation_line)
-        self.line(line)
-        self.line(punctuation_line)
+            self.line(punctuation_line, line, punctuation_line)
+        else:
+            self.line(line, punctuation_line)
 
     def title(self, title: str) -> None:
         """
@@ -179,24 +242,46 @@ class SphinxWriter(Writer):
         if not args:
             self.line(f".. {name}::")
         else:
-            self.line(f".. {name}:: {args[0]}")
             spacer = " " * (5 + len(name))
-            for arg in args[1:]:
-                self.line(f"{spacer} {arg}")
+            self.line(
+                f".. {name}:: {args[0]}", *(f"{spacer} {arg}" for arg in args[1:])
+            )
 
         self.indent_level += 1
 
-        if options:
-            for option_name, value in options:
-                self.line(f":{option_name}: {value}")
-
-        self.line("")
+        # Options and the blank line ending the directive head in one write
+        self.line(
+            *(f":{option_name}: {value}" for option_name, value in options or []),
+            "",
+        )
         yield
 
         self.indent_level -= 1
         self.line("")
 
 
+SPHINX_CONF_TEMPLATE = """\
+html_theme = 'furo'
+
+import shutil
+import os
+def setup(app):
+    shutil.copytree(
+        os.path.join('{doxygen_path}', 'html'),
+        os.path.join(app.outdir, 'doxygen'),
+        dirs_exist_ok=True
+    )
+"""
+
+SPHINX_INDEX = """\
+*********************
+Rizin Python Bindings
+*********************
+.. toctree::
+   classes
+"""
+
+
 def generate(output_dir: str) -> None:
     """
     Generate sphinx docs and write to sphinx/ directory
@@ -206,53 +291,71 @@ def generate(output_dir: str) -> None:
     with suppress(FileExistsError):
         os.mkdir(sphinx_dir)
 
-    with open(os.path.join(sphinx_dir, "conf.py"), "w", encoding="utf-8") as output:
-        writer = Writer(output)
-        writer.line(
-            "html_theme = 'furo'",
-            "",
-            "import shutil",
-            "import os",
-            "def setup(app):",
-            "    shutil.copytree(",
-            f"        os.path.join('{doxygen_path}', 'html'),",
-            "        os.path.join(app.outdir, 'doxygen'),",
-            "        dirs_exist_ok=True",
-            "    )",
-        )
-
-    with open(os.path.join(sphinx_dir, "index.rst"), "w", encoding="utf-8") as output:
-        writer = SphinxWriter(output)
-        writer.title("Rizin Python Bindings")
-        writer.line(
-            ".. toctree::",
-            "   classes",
-        )
+    write_file(
+        os.path.join(sphinx_dir, "conf.py"),
+        SPHINX_CONF_TEMPLATE.format(doxygen_path=doxygen_path),
+    )
+    write_file(os.path.join(sphinx_dir, "index.rst"), SPHINX_INDEX)
 
     if doxygen_path:
-        tree = ET.parse(os.path.join(doxygen_path, "xml", "index.xml"))
-
-        for filenode in tree.findall("./compound[@kind='file']"):
-            refid = filenode.attrib["refid"]
-            filename = filenode.findtext("name")
-            assert filename
-
-            for membernode in filenode.findall("./member"):
-                name = membernode.findtext("name")
-                kind = membernode.attrib["kind"]
-                if kind == "function":
-                    assert name
-                    doxygen_functions.function_files[name].append(
-                        DoxygenFile(
-                            name=filename,
-                            refid=refid,
-                            path=os.path.join(doxygen_path, "xml", f"{refid}.xml"),
-                        )
-                    )
+        read_doxygen_index(doxygen_path, os.path.join(sphinx_dir, ".doxygen_index"))
 
     generate_classes(sphinx_dir)
 
 
+DoxygenIndexKey = Tuple[int, str, int]
+DoxygenIndex = DefaultDict[str, List[DoxygenFile]]
+
+# Bump when the pickled DoxygenIndex layout changes
+DOXYGEN_INDEX_CACHE_VERSION = 1
+
+
+def read_doxygen_index(path: str, cache_path: str) -> None:
+    """
+    Map function names to Doxygen XML files from path/xml/index.xml
+
+    The mapping is pickled to cache_path, and reused
+    as long as index.xml has not been modified
+    """
+    xml_dir = os.path.abspath(os.path.join(path, "xml"))
+    index_path = os.path.join(xml_dir, "index.xml")
+    key: DoxygenIndexKey = (
+        DOXYGEN_INDEX_CACHE_VERSION,
+        index_path,
+        os.stat(index_path).st_mtime_ns,
+    )
+
+    # Any unreadable or malformed cache is rebuilt from index.xml
+    with suppress(Exception):
+        with open(cache_path, "rb") as cache:
+            cached_key, function_files = cast(
+                Tuple[DoxygenIndexKey, DoxygenIndex], pickle.load(cache)
+            )
+        if cached_key == key:
+            doxygen_functions.function_files = function_files
+            return
+
+    tree = ET.parse(index_path)
+
+    for filenode in tree.findall("./compound[@kind='file']"):
+        refid = filenode.attrib["refid"]
+        filename = filenode.findtext("name")
+        assert filename
+
+        doxygen_file = DoxygenFile(
+            name=filename,
+            refid=refid,
+            path=os.path.join(xml_dir, f"{refid}.xml"),
+        )
+        for membernode in filenode.iterfind("./member[@kind='function']"):
+            name = membernode.findtext("name")
+            assert name
+            doxygen_functions.function_files[name].append(doxygen_file)
+
+    with open(cache_path, "wb") as cache:
+        pickle.dump((key, doxygen_functions.function_files), cache)
+
+
 def generate_classes(sphinx_dir: str) -> None:
     """
     Generate sphinx classes docs
@@ -268,18 +371,43 @@ def generate_classes(sphinx_dir: str) -> None:
         writer.title("Classes")
 
         with writer.directive("toctree"):
-            for classname in sorted(classes):
-                writer.line(f"classes/{classname}")
+            writer.line(*(f"classes/{classname}" for classname in sorted(classes)))
 
     classes_dir = os.path.join(sphinx_dir, "classes")
     with suppress(FileExistsError):
         os.mkdir(classes_dir)
 
+    # Parse the Doxygen files in the order write_class will look them up
+    if doxygen_path:
+        doxygen_files.prefetch(
+            [
+                doxygen_functions.file(func.cfunc.cursor.spelling).path
+                for cls in classes.values()
+                for func_dict in [cls.funcs, cls.methods]
+                for _, func in sorted(func_dict.items())
+            ]
+        )
+
+    # Rendering reads shared Doxygen state, so render serially
+    # and only write the files in parallel
+    paths = []
+    contents = []
     for name, cls in classes.items():
-        with open(
-            os.path.join(classes_dir, f"{name}.rst"), "w", encoding="utf-8"
-        ) as output:
+        with io.StringIO() as output:
             write_class(SphinxWriter(output), cls)
+            contents.append(output.getvalue())
+        paths.append(os.path.join(classes_dir, f"{name}.rst"))
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        list(executor.map(write_file, paths, contents))
+
+
+def write_file(path: str, contents: str) -> None:
+    """
+    Write contents to the file at path
+    """
+    with open(path, "w", encoding="utf-8") as output:
+        output.write(contents)
 
 
 def write_class(writer: SphinxWriter, cls: Class) -> None:
@@ -492,6 +620,12 @@ def write_doxygen_function(writer: SphinxWriter, name: str) -> None:
         writer.line("".join(segments), "")
 
 
+# Pointers to these kinds are annotated as str
+char_kinds = frozenset({TypeKind.SCHAR, TypeKind.CHAR_S})
+# These kinds are annotated as float
+float_kinds = frozenset({TypeKind.FLOAT, TypeKind.DOUBLE})
+
+
 def stringify_ctype(ctype: CType) -> str:
     """
     Translate a CType to a Python type annotation
@@ -513,7 +647,7 @@ def stringify_ctype(ctype: CType) -> str:
             if kind == TypeKind.VOID:
                 inner = "Any"
                 break
-            if kind in [TypeKind.SCHAR, TypeKind.CHAR_S]:
+            if kind in char_kinds:
                 inner = "str"
                 break
 
@@ -528,7 +662,7 @@ def stringify_ctype(ctype: CType) -> str:
             if kind == TypeKind.BOOL:
                 return "bool"
 
-            if kind in [TypeKind.FLOAT, TypeKind.DOUBLE]:
+            if kind in float_kinds:
                 return "float"
 
             return "int"
@@ -3,6 +3,7 @@ SPDX-FileCopyrightText: 2022 wingdeans <wingdeans@protonmail.com>
 SPDX-License-Identifier: LGPL-3.0-only
 """
 
+import io
 import os
 from enum import Enum as PyEnum
 
@@ -32,20 +33,26 @@ def generate(output_dir: str) -> None:
     """
     Generate SWIG bindings and write to output_dir/rizin.i
     """
+    # Render in memory and write the file once
+    with io.StringIO() as output:
+        write(Writer(output))
+        contents = output.getvalue()
+
     output_path = os.path.join(output_dir, "rizin.i")
     with open(output_path, "w", encoding="utf-8") as output_file:
-        write(Writer(output_file))
+        output_file.write(contents)
 
 
 def write(writer: Writer) -> None:
     """
     Toplevel SWIG generator
     """
-    writer.line("%module(directors=1) rizin")
-    writer.line("%{")
-    for header in headers:
-        writer.line(f"#include <{header.name}>")
-    writer.line("%}")
+    writer.line(
+        "%module(directors=1) rizin",
+        "%{",
+        *(f"#include <{header.name}>" for header in headers),
+        "%}",
+    )
 
     writer.snippet("snippets_swig/prologue.i")
     writer.snippet("snippets_swig/cmd_director.i")
@@ -91,6 +98,20 @@ class FuncKind(PyEnum):
     GENERIC = 5
 
 
+# Signature line for each kind of function, formatted with the
+# declaration of its name and return type, its name, and its arguments
+signature_formats = {
+    FuncKind.METHOD: "{decl}({args}) {{",
+    FuncKind.GENERIC: "{decl}({args}) {{",
+    FuncKind.STATIC: "static {decl}({args}) {{",
+    FuncKind.CONSTRUCTOR: "{name}({args}) {{",
+    FuncKind.DESTRUCTOR: "~{name}({args}) {{",
+}
+
+# Kinds declared with a return type (constructors and destructors are not)
+kinds_with_return_type = frozenset({FuncKind.METHOD, FuncKind.GENERIC, FuncKind.STATIC})
+
+
 def write_generic(writer: Writer, generic: Generic) -> None:
     """
     Generate generic definition and specializations
@@ -122,8 +143,13 @@ def write_generic(writer: Writer, generic: Generic) -> None:
         writer.line("}")
     writer.line("%enddef")
 
-    for specialization in generic.specializations:
-        writer.line(f"%{generic.name}({specialization})")
+    # Sort specializations (a set) so that output is reproducible
+    writer.line(
+        *(
+            f"%{generic.name}({specialization})"
+            for specialization in sorted(generic.specializations)
+        )
+    )
 
     for specialization, extension in generic.specialization_extensions.items():
         writer.line(f"%extend {generic.name}_{specialization} {{")
@@ -144,11 +170,11 @@ def stringify_decl(expr: str, ctype: CType, generic: bool = False) -> str:
                 return f"bool {expr}"
             if generic and ctype.type_.kind == TypeKind.VOID:
                 return f"TYPE {expr}"
-            return f"{ctype.type_.spelling} {expr}"
+            return f"{ctype.spelling} {expr}"
 
-        # type_.spelling automatically applies const
+        # ctype.spelling automatically applies const
         # for other ctypes, do so manually
-        if ctype.type_.is_const_qualified():
+        if ctype.const_qualified:
             expr = "const " + expr
 
         if isinstance(ctype, CPointerType):
@@ -199,23 +225,34 @@ def write_class(writer: Writer, cls: Class) -> None:
         f"%rename {cls.struct_name} {cls.name};",
     )
 
+    renamed_fields = [field for field in cls.fields.values() if field.rename]
+
     # %rename fields
-    for field in cls.fields.values():
-        if field.rename:
-            writer.line(f"%rename {cls.struct_name}::{field.name} {field.rename};")
+    writer.line(
+        *(
+            f"%rename {cls.struct_name}::{field.name} {field.rename};"
+            for field in renamed_fields
+        )
+    )
 
     # Main struct
-    writer.line(f"struct {cls.struct_name} {{")
-    with writer.indent():
-        for field in cls.fields.values():
-            decl = stringify_decl(field.name, field.ctype)
-            writer.line(f"{decl};")
-    writer.line("};")
+    if not cls.fields:  # Opaque or empty struct
+        writer.line(f"struct {cls.struct_name} {{}};")
+    else:
+        writer.line(f"struct {cls.struct_name} {{")
+        with writer.indent():
+            writer.line(
+                *(
+                    f"{stringify_decl(field.name, field.ctype)};"
+                    for field in cls.fields.values()
+                )
+            )
+        writer.line("};")
 
     # un %rename fields
-    for field in cls.fields.values():
-        if field.rename:
-            writer.line(f'%rename {cls.struct_name}::{field.name} "";')
+    writer.line(
+        *(f'%rename {cls.struct_name}::{field.name} "";' for field in renamed_fields)
+    )
 
     # Extension
     if len(cls.funcs) != 0 or len(cls.methods) != 0:
@@ -244,44 +281,30 @@ def write_func(writer: Writer, func: Func, name: str, kind: FuncKind) -> None:
         typemap_args = ", ".join(f"{arg.type_} {arg.name}" for arg in typemap.args)
         writer.line(f"%{typemap.name}_activate({typemap_args})")
 
-    decl = stringify_decl(
-        name,
-        func.cfunc.result_ctype,
-        isinstance(func, GenericFunc) and func.generic_ret,
-    )
-
-    args_outer = []
-    if kind in [FuncKind.METHOD, FuncKind.DESTRUCTOR, FuncKind.GENERIC]:
-        args_inner = ["$self"]
-        args = func.cfunc.args[1:]
-    else:
-        args_inner = []
-        args = func.cfunc.args
+    self_arg = kind in [FuncKind.METHOD, FuncKind.DESTRUCTOR, FuncKind.GENERIC]
+    args = func.cfunc.args[1:] if self_arg else func.cfunc.args
 
-    args_nonnull = []  # Used for nullability contract
-
-    for arg in args:
-        arg_name = arg.cursor.spelling
-        if arg_name == "self":
-            arg_name = "_self"
-
-        arg_decl = stringify_decl(
+    arg_names = [
+        "_self" if arg.cursor.spelling == "self" else arg.cursor.spelling
+        for arg in args
+    ]
+    args_outer = [
+        stringify_decl(
             arg_name,
             arg.ctype,
             isinstance(func, GenericFunc) and arg.cursor.spelling in func.generic_args,
         )
-
-        if arg.default:
-            arg_decl += f" = {arg.default}"
-
-        args_outer.append(arg_decl)
-        args_inner.append(arg_name)
-
-        if "RZ_NONNULL" in arg.attrs:
-            args_nonnull.append(arg_name)
+        + (f" = {arg.default}" if arg.default else "")
+        for arg, arg_name in zip(args, arg_names)
+    ]
+    args_nonnull = [  # Used for nullability contract
+        arg_name for arg, arg_name in zip(args, arg_names) if "RZ_NONNULL" in arg.attrs
+    ]
 
     args_outer_str = ", ".join(args_outer)
-    args_inner_str = ", ".join(args_inner)
+    args_inner_str = ", ".join(arg_names)
+    if self_arg:
+        args_inner_str = f"$self, {args_inner_str}" if args_inner_str else "$self"
 
     # Nullability checking contract
     if args_nonnull:
@@ -291,14 +314,17 @@ def write_func(writer: Writer, func: Func, name: str, kind: FuncKind) -> None:
                 writer.line(f"{contract_arg} != NULL;")
         writer.line("}")
 
-    if kind in [FuncKind.METHOD, FuncKind.GENERIC]:
-        writer.line(f"{decl}({args_outer_str}) {{")
-    elif kind == FuncKind.STATIC:
-        writer.line(f"static {decl}({args_outer_str}) {{")
-    elif kind == FuncKind.CONSTRUCTOR:
-        writer.line(f"{name}({args_outer_str}) {{")
-    elif kind == FuncKind.DESTRUCTOR:
-        writer.line(f"~{name}({args_outer_str}) {{")
+    if kind in kinds_with_return_type:
+        decl = stringify_decl(
+            name,
+            func.cfunc.result_ctype,
+            isinstance(func, GenericFunc) and func.generic_ret,
+        )
+    else:
+        decl = ""
+    writer.line(
+        signature_formats[kind].format(decl=decl, name=name, args=args_outer_str)
+    )
 
     with writer.indent():
         if "RZ_DEPRECATE" in func.cfunc.attrs:
@@ -44,6 +44,11 @@ void rizin_try_warn_deprecate(const char *name, const char *c_name) {
     typedef char* String;
 %}
 %array_class(String, Array_String);
+%inline %{
+    String String_at(String *array, int i) {
+        return array[i];
+    }
+%}
 
 // Python plugin
 %pythoncode %{
@@ -16,34 +16,38 @@ def register_command(self, cmd, fn):
         core_arg = params[0].name
         params = params[1:]
 
+    # RzFlagItem and RzAnalysisFunction are not yet defined in the class body
+    arg_types = {
+        str: (RZ_CMD_ARG_TYPE_STRING, lambda core, arg: arg),
+        RzNumArg: (RZ_CMD_ARG_TYPE_RZNUM, lambda core, arg: core.num.math(arg)),
+        int: (RZ_CMD_ARG_TYPE_NUM, lambda core, arg: int(arg)),
+        RzFilenameArg: (RZ_CMD_ARG_TYPE_FILE, lambda core, arg: arg),
+        RzFlagItem: (RZ_CMD_ARG_TYPE_FLAG, lambda core, arg: core.flags.get(arg)),
+        RzAnalysisFunction: (
+            RZ_CMD_ARG_TYPE_FCN,
+            lambda core, arg: core.analysis.get_function_byname(arg),
+        ),
+    }
+
     desc_args = Array_RzCmdDescArg(len(params) + 1)
     desc_args.thisown = False
+    converters = []  # (name, function converting the argv string) per param
     for i, param in enumerate(params):
         if not param.annotation:
             raise Exception(f"Parameter {param.name} has no annotation")
 
-        desc_arg = RzCmdDescArg()
-        desc_arg.name = param.name
-
-        if param.annotation == str:
-            desc_arg.type = RZ_CMD_ARG_TYPE_STRING
-        elif param.annotation == RzNumArg:
-            desc_arg.type = RZ_CMD_ARG_TYPE_RZNUM
-        elif param.annotation == int:
-            desc_arg.type = RZ_CMD_ARG_TYPE_NUM
-        elif param.annotation == RzFilenameArg:
-            desc_arg.type = RZ_CMD_ARG_TYPE_FILE
-        elif param.annotation == RzFlagItem:
-            desc_arg.type = RZ_CMD_ARG_TYPE_FLAG
-        elif param.annotation == RzAnalysisFunction:
-            desc_arg.type = RZ_CMD_ARG_TYPE_FCN
-        else:
+        arg_type = arg_types.get(param.annotation)
+        if arg_type is None:
             raise Exception(
                 f"Parameter {param.name} has unknown type {param.annotation}"
             )
 
+        desc_arg = RzCmdDescArg()
+        desc_arg.name = param.name
+        desc_arg.type, convert = arg_type
         desc_arg.thisown = False
         desc_args[i] = desc_arg
+        converters.append((param.name, convert))
 
     null_arg = RzCmdDescArg()
     null_arg.thisown = False
@@ -56,21 +60,12 @@ def register_command(self, cmd, fn):
     class wrapper(CmdDirector):
         def run(self, core, argc, argv):
             try:
-                args = {}
-                args_array = Array_String.frompointer(argv)
+                args = {
+                    name: convert(core, String_at(argv, i))
+                    for i, (name, convert) in enumerate(converters, 1)
+                }
                 if core_arg:
                     args[core_arg] = core
-                for i, param in enumerate(params):
-                    arg = args_array[i + 1]
-                    if param.annotation == RzNumArg:
-                        arg = core.num.math(arg)
-                    elif param.annotation == int:
-                        arg = int(arg)
-                    elif param.annotation == RzFlagItem:
-                        arg = core.flags.get(arg)
-                    elif param.annotation == RzAnalysisFunction:
-                        arg = core.analysis.get_function_byname(arg)
-                    args[param.name] = arg
                 return fn(**args)
             except Exception as e:
                 print(e)
@@ -14,6 +14,8 @@ class Writer:
     Helper class for writing indented lines to an output
     """
 
+    __slots__ = ("output", "indent_level", "indent_amount")
+
     output: TextIO
     indent_level: int
     indent_amount: int
@@ -27,11 +29,8 @@ class Writer:
         """
         Write lines at current indentation
         """
-        for line in lines:
-            indent = self.indent_amount * self.indent_level
-            self.output.write(" " * indent)
-            self.output.write(line)
-            self.output.write("\n")
+        indent = " " * (self.indent_amount * self.indent_level)
+        self.output.write("".join(f"{indent}{line}\n" for line in lines))
 
     @contextmanager
     def indent(self) -> Iterator[None]: